@@ -0,0 +1,28 @@
+"""
+Optional native build for the services hot path.
+
+`python setup.py build_ext --inplace` compiles src/utils/parser.py with mypyc
+(`pip install mypy`) and drops the extension next to the source; without it the
+pure-Python module is imported as usual.
+"""
+
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+except ImportError:  # pragma: no cover - mypy not installed; nothing is compiled
+    mypycify = None
+
+setup(
+    name="tiktok-shop-scraper",
+    ext_modules=(
+        mypycify(
+            # src/ is not a package; resolve the module as src.utils.parser.
+            # dateutil ships no stubs, so its calls are compiled as Any.
+            ["--explicit-package-bases", "--ignore-missing-imports", "src/utils/parser.py"],
+            opt_level="3",
+        )
+        if mypycify is not None
+        else []
+    ),
+)
@@ -1,10 +1,15 @@
 import json
 import logging
-from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Optional
+import re
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import requests
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 
 from .utils_format import (
     clean_price,
@@ -15,7 +20,52 @@ from .utils_format import (
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json is used instead
+    orjson = None  # type: ignore[assignment]
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - BeautifulSoup card parsing is used instead
+    LexborHTMLParser = None  # type: ignore[assignment,misc]
+
+try:
+    import lxml  # noqa: F401
+
+    DEFAULT_HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover - only used when dependency missing
+    DEFAULT_HTML_PARSER = "html.parser"
+
+def _key_variants(name: str) -> frozenset:
+    return frozenset((name, name.capitalize(), name.upper()))
+
+# Spellings accepted by _looks_like_product_dict. Matching against these sets
+# avoids lowering every key of every dict visited during the JSON walk.
+_TITLE_KEYS = _key_variants("title")
+_PRICE_KEYS = _key_variants("price")
+_NAME_KEYS = _key_variants("name")
+_IMAGE_KEYS = _key_variants("image")
+_OFFERS_KEYS = _key_variants("offers")
+_JSON_DECODER = json.JSONDecoder()
+
+# Text-node predicates, compiled once instead of rebuilding lambdas per call.
+_DIGIT_RE = re.compile(r"\d")
+_DOLLAR_RE = re.compile(r"\$")
+_SOLD_RE = re.compile("sold", re.IGNORECASE)
+
+# Page detection and JSON extraction only need the document head and script
+# tags; the card fallback only needs anchors and divs (with their children).
+_HEAD_STRAINER = SoupStrainer(["meta", "title", "script"])
+_CARD_STRAINER = SoupStrainer(["a", "div"])
+
+_PRICE_META_SELECTOR = soupsieve.compile(
+    "meta[itemprop='price'], meta[property='product:price:amount']"
+)
+_CARD_CSS = ("a[href*='/product/']", "div[data-e2e='search-card']")
+_CARD_SELECTORS = tuple(soupsieve.compile(css) for css in _CARD_CSS)
+
+@dataclass(slots=True, frozen=True)
 class Product:
     title: str
     origin_price: Optional[str]
@@ -26,7 +76,19 @@ class Product:
     img: Optional[str]
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # All fields are flat strings, so skip asdict()'s recursive deep copy.
+        return {
+            "title": self.title,
+            "origin_price": self.origin_price,
+            "sale_price": self.sale_price,
+            "score": self.score,
+            "sold": self.sold,
+            "product_link": self.product_link,
+            "img": self.img,
+        }
+
+# Column order of Product.to_dict(); lets exporters skip scanning rows for keys.
+PRODUCT_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(Product))
 
 class TikTokShopScraper:
     """
@@ -37,9 +99,30 @@ class TikTokShopScraper:
     expected structures cannot be found.
     """
 
-    def __init__(self, user_agent: Optional[str] = None, timeout: int = 15) -> None:
+    def __init__(
+        self,
+        user_agent: Optional[str] = None,
+        timeout: int = 15,
+        html_parser: str = DEFAULT_HTML_PARSER,
+        pool_size: int = 32,
+    ) -> None:
         self.session = requests.Session()
         self.timeout = timeout
+        self.html_parser = html_parser
+
+        # One pooled adapter for both schemes so repeated requests to the same
+        # host reuse the keep-alive connection instead of re-handshaking.
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update(
             {
                 "User-Agent": user_agent
@@ -49,9 +132,18 @@ class TikTokShopScraper:
                     "Chrome/120.0.0.0 Safari/537.36"
                 ),
                 "Accept-Language": "en-US,en;q=0.9",
+                # gzip/deflate, plus br whenever a brotli decoder is importable
+                "Accept-Encoding": DEFAULT_ACCEPT_ENCODING,
+                "Connection": "keep-alive",
             }
         )
 
+    def close(self) -> None:
+        """
+        Release pooled connections held by the underlying session.
+        """
+        self.session.close()
+
     def scrape_url(self, url: str) -> List[Dict[str, Any]]:
         """
         Decide whether URL is a product or listing URL and parse accordingly.
@@ -59,14 +151,33 @@ class TikTokShopScraper:
         response = self.session.get(url, timeout=self.timeout)
         response.raise_for_status()
 
-        html = response.text
-        soup = BeautifulSoup(html, "html.parser")
+        # Hand BS4 the raw bytes plus any charset from the Content-Type header;
+        # without one, BS4 falls back to the BOM / <meta> charset or sniffing.
+        content = response.content
+        encoding = self._declared_encoding(response)
+        head_soup = BeautifulSoup(
+            content, self.html_parser, parse_only=_HEAD_STRAINER, from_encoding=encoding
+        )
 
-        if self._looks_like_product_page(soup):
+        if self._looks_like_product_page(head_soup):
+            soup = BeautifulSoup(content, self.html_parser, from_encoding=encoding)
             product = self._parse_product_page(soup, url)
             return [product.to_dict()] if product else []
         else:
-            return [p.to_dict() for p in self._parse_listing_page(soup, url)]
+            products = self._parse_listing_page(head_soup, content, url, encoding)
+            return [p.to_dict() for p in products]
+
+    @staticmethod
+    def _declared_encoding(response: requests.Response) -> Optional[str]:
+        """
+        Charset named in the Content-Type header, if any. requests reports
+        ISO-8859-1 for any text/* response without one, so that default is
+        not trusted.
+        """
+        content_type = response.headers.get("Content-Type", "")
+        if "charset" not in content_type.lower():
+            return None
+        return response.encoding
 
     @staticmethod
     def _looks_like_product_page(soup: BeautifulSoup) -> bool:
@@ -81,21 +192,24 @@ class TikTokShopScraper:
         if title_tag and "tiktok shop" in title_tag.text.lower():
             return "product" in title_tag.text.lower()
 
-        return bool(soup.select("meta[itemprop='price'], meta[property='product:price:amount']"))
+        return _PRICE_META_SELECTOR.select_one(soup) is not None
 
     def _parse_product_page(self, soup: BeautifulSoup, url: str) -> Optional[Product]:
         """
         Parse a single product page into a Product dataclass.
         """
         logger.debug("Parsing product page: %s", url)
-        title = self._extract_title(soup)
+        meta = self._collect_meta(soup)
+        text_hits = self._scan_text(soup)
+
+        title = self._extract_title(soup, meta)
         if not title:
             logger.warning("Could not extract title for %s", url)
 
-        origin_price, sale_price = self._extract_prices(soup)
-        score = self._extract_score(soup)
-        sold = self._extract_sold(soup)
-        img = self._extract_image(soup)
+        origin_price, sale_price = self._extract_prices(meta, text_hits)
+        score = self._extract_score(meta, text_hits)
+        sold = text_hits["sold"]
+        img = self._extract_image(soup, meta)
 
         return Product(
             title=title or "",
@@ -107,93 +221,114 @@ class TikTokShopScraper:
             img=img,
         )
 
-    def _parse_listing_page(self, soup: BeautifulSoup, url: str) -> List[Product]:
+    def _parse_listing_page(
+        self,
+        head_soup: BeautifulSoup,
+        content: bytes,
+        url: str,
+        encoding: Optional[str] = None,
+    ) -> List[Product]:
         """
         Parse a listing / category page. This is highly dependent on TikTok's HTML,
         so we rely on generic product card selectors and JSON blobs.
+
+        ``head_soup`` only holds meta/title/script tags; the card markup in
+        ``content`` is parsed only when no JSON blob yields products.
         """
         logger.debug("Parsing listing page: %s", url)
 
         products: List[Product] = []
+        # product_links already emitted; checked before a Product is built
+        seen: Set[str] = set()
 
         # Strategy 1: Look for JSON scripts that contain product data
-        for script in soup.find_all("script"):
+        for script in head_soup.find_all("script"):
             script_text = script.string or ""
             if not script_text:
                 continue
-            if '"product"' in script_text.lower() and '"price"' in script_text.lower():
-                try:
-                    data = self._extract_json_from_script(script_text)
-                except ValueError:
-                    continue
-                products.extend(self._products_from_json_blob(data, url))
+            lowered = script_text.lower()
+            if '"product"' in lowered and '"price"' in lowered:
+                for data in self._iter_json_from_script(script_text):
+                    products.extend(self._products_from_json_blob(data, url, seen))
 
         # Strategy 2: Fallback to card-based parsing
         if not products:
-            card_selectors = [
-                "a[href*='/product/']",
-                "div[data-e2e='search-card']",
-            ]
-            for selector in card_selectors:
-                for card in soup.select(selector):
-                    product = self._product_from_card(card, url)
-                    if product:
-                        products.append(product)
-
-        # De-duplicate by product_link
-        unique: Dict[str, Product] = {}
-        for product in products:
-            if product.product_link not in unique:
-                unique[product.product_link] = product
-
-        logger.info("Parsed %d products from listing %s", len(unique), url)
-        return list(unique.values())
-
-    def _extract_json_from_script(self, text: str) -> Any:
+            # head_soup's encoding is the header charset when it decoded the
+            # page, else BS4's BOM / <meta> / sniffed guess; cards use the same.
+            card_encoding = head_soup.original_encoding or encoding
+            products = self._products_from_cards(content, url, seen, card_encoding)
+
+        logger.info("Parsed %d products from listing %s", len(products), url)
+        return products
+
+    def _iter_json_from_script(self, text: str) -> Iterator[Any]:
         """
-        Attempt to load JSON from a script tag content. TikTok often embeds
-        window.__INIT_PROPS__ or similar structures.
+        Yield every JSON object embedded in a script tag's content. TikTok often
+        embeds window.__INIT_PROPS__ or similar structures, sometimes after
+        unrelated config objects in the same script.
         """
-        # Naive approach: find first {...} block that parses as JSON.
+        # Pure JSON payloads (e.g. <script type="application/json">) go straight
+        # to orjson; anything else falls through to the raw_decode scan.
+        if orjson is not None:
+            stripped = text.strip()
+            if stripped.startswith("{"):
+                try:
+                    data = orjson.loads(stripped)
+                except orjson.JSONDecodeError:
+                    pass
+                else:
+                    yield data
+                    return
+
+        # raw_decode parses the object starting at a "{" in place and stops at
+        # its closing brace; scanning resumes after it, so nested objects are
+        # not yielded twice and no candidate slices are copied.
         start = text.find("{")
         while start != -1:
-            end = text.rfind("}")
-            if end == -1 or end <= start:
-                break
-            candidate = text[start : end + 1]
             try:
-                return json.loads(candidate)
-            except Exception:
-                end = text.rfind("}", start, end)
-                if end == -1:
-                    break
-            start = text.find("{", start + 1)
-        raise ValueError("Could not extract JSON from script block")
-
-    def _products_from_json_blob(self, data: Any, base_url: str) -> List[Product]:
+                data, end = _JSON_DECODER.raw_decode(text, start)
+            except ValueError:
+                start = text.find("{", start + 1)
+                continue
+            yield data
+            start = text.find("{", end)
+
+    def _products_from_json_blob(
+        self, data: Any, base_url: str, seen: Set[str]
+    ) -> List[Product]:
         products: List[Product] = []
+        looks_like_product = self._looks_like_product_dict
 
-        def walk(node: Any) -> None:
+        # Iterative pre-order walk: deep embedded state must not hit the
+        # recursion limit. Children are pushed reversed to keep document order.
+        stack: List[Any] = [data]
+        while stack:
+            node = stack.pop()
             if isinstance(node, dict):
-                if self._looks_like_product_dict(node):
-                    products.append(self._product_from_dict(node, base_url))
-                for value in node.values():
-                    walk(value)
+                if looks_like_product(node):
+                    link = normalize_product_link(node.get("url") or base_url)
+                    if link not in seen:
+                        seen.add(link)
+                        products.append(self._product_from_dict(node, link))
+                stack.extend(reversed(node.values()))
             elif isinstance(node, list):
-                for item in node:
-                    walk(item)
+                stack.extend(reversed(node))
 
-        walk(data)
         return products
 
     @staticmethod
     def _looks_like_product_dict(node: Dict[str, Any]) -> bool:
-        keys = {k.lower() for k in node.keys()}
-        return {"title", "price"}.issubset(keys) or (
-            "name" in keys and "image" in keys and ("price" in keys or "offers" in keys)
+        keys = node.keys()
+        has_price = not keys.isdisjoint(_PRICE_KEYS)
+        if has_price and not keys.isdisjoint(_TITLE_KEYS):
+            return True
+        return (
+            not keys.isdisjoint(_NAME_KEYS)
+            and not keys.isdisjoint(_IMAGE_KEYS)
+            and (has_price or not keys.isdisjoint(_OFFERS_KEYS))
         )
 
-    def _product_from_dict(self, node: Dict[str, Any], base_url: str) -> Product:
+    def _product_from_dict(self, node: Dict[str, Any], link: str) -> Product:
         title = node.get("title") or node.get("name", "")
         image = None
         if isinstance(node.get("image"), list):
@@ -212,27 +347,121 @@ class TikTokShopScraper:
         score = str(node.get("ratingValue") or node.get("rating", ""))
         sold = str(node.get("sold") or node.get("soldCount") or "")
 
-        link = node.get("url") or base_url
         return Product(
             title=title,
             origin_price=clean_price(origin_price),
             sale_price=clean_price(raw_price),
             score=clean_score(score),
             sold=clean_sold(sold),
-            product_link=normalize_product_link(link),
+            product_link=link,
             img=image,
         )
 
-    def _product_from_card(self, card: Any, base_url: str) -> Optional[Product]:
+    def _products_from_cards(
+        self, content: bytes, url: str, seen: Set[str], encoding: Optional[str] = None
+    ) -> List[Product]:
+        """
+        Card-based listing fallback. Uses selectolax's C parser when it is
+        installed and BeautifulSoup otherwise; both apply the same heuristics.
+        """
+        if LexborHTMLParser is not None:
+            # Lexbor reads bytes as UTF-8, so decode with the page's charset first.
+            markup: Any = content
+            if encoding:
+                try:
+                    markup = content.decode(encoding, "replace")
+                except LookupError:
+                    pass  # unknown codec name; leave the bytes to Lexbor
+            tree = LexborHTMLParser(markup)
+            cards: Iterable[Any] = (card for css in _CARD_CSS for card in tree.css(css))
+            card_href = self._node_href
+            build = self._product_from_node
+        else:
+            card_soup = BeautifulSoup(
+                content, self.html_parser, parse_only=_CARD_STRAINER, from_encoding=encoding
+            )
+            cards = (card for selector in _CARD_SELECTORS for card in selector.select(card_soup))
+            card_href = self._card_href
+            build = self._product_from_card
+
+        products: List[Product] = []
+        for card in cards:
+            href = card_href(card)
+            link = normalize_product_link(url if href is None else href)
+            if link in seen:
+                continue
+            product = build(card, link)
+            if product:
+                seen.add(link)
+                products.append(product)
+        return products
+
+    @staticmethod
+    def _card_href(card: Any) -> Optional[str]:
+        link_el = card.find("a", href=True)
+        return link_el["href"] if link_el else None
+
+    @staticmethod
+    def _node_href(card: Any) -> Optional[str]:
+        # selectolax matches the node itself; find() only looks at descendants.
+        for link_el in card.css("a[href]"):
+            if link_el != card:
+                return link_el.attributes.get("href")
+        return None
+
+    def _product_from_node(self, card: Any, link: str) -> Optional[Product]:
+        """
+        selectolax counterpart of ``_product_from_card``.
+        """
+        title_el = card.css_first("span") or card.css_first("h3") or card.css_first("h2")
+        title = title_el.text(separator="", strip=True) if title_el else ""
+
+        price = ""
+        for span in card.css("span"):
+            string = self._node_string(span)
+            if string is not None and "$" in string:
+                price = span.text(separator="", strip=True)
+                break
+
+        img_el = card.css_first("img")
+        img = img_el.attributes.get("src") if img_el else None
+
+        if not title and not price:
+            return None
+
+        return Product(
+            title=title,
+            origin_price=None,
+            sale_price=clean_price(price),
+            score=clean_score(""),
+            sold=clean_sold(""),
+            product_link=link,
+            img=img,
+        )
+
+    @staticmethod
+    def _node_string(node: Any) -> Optional[str]:
+        """
+        selectolax counterpart of BS4's ``Tag.string``: descend while the node
+        has exactly one child and return the text (or comment) reached, if any.
+        """
+        while True:
+            child = node.child
+            if child is None or child.next is not None:
+                return None
+            if child.tag == "-text":
+                return child.text(deep=False)
+            if child.tag == "-comment":
+                return child.comment_content
+            node = child
+
+    def _product_from_card(self, card: Any, link: str) -> Optional[Product]:
         title_el = card.find("span") or card.find("h3") or card.find("h2")
         title = title_el.get_text(strip=True) if title_el else ""
 
-        price_el = card.find("span", string=lambda x: x and "$" in x)
+        price_el = card.find("span", string=_DOLLAR_RE)
         price = price_el.get_text(strip=True) if price_el else ""
 
-        link_el = card.find("a", href=True)
-        link = link_el["href"] if link_el else base_url
-
         img_el = card.find("img")
         img = img_el.get("src") if img_el else None
 
@@ -248,15 +477,54 @@ class TikTokShopScraper:
             sale_price=clean_price(price),
             score=clean_score(score),
             sold=clean_sold(sold),
-            product_link=normalize_product_link(link),
+            product_link=link,
             img=img,
         )
 
     @staticmethod
-    def _extract_title(soup: BeautifulSoup) -> Optional[str]:
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            return og_title["content"].strip()
+    def _collect_meta(soup: BeautifulSoup) -> Dict[str, Optional[str]]:
+        """
+        Map every meta ``property``/``itemprop`` to its content in one pass.
+        The first tag wins, matching what ``soup.find`` would return.
+        """
+        meta: Dict[str, Optional[str]] = {}
+        for tag in soup.find_all("meta"):
+            content = tag.get("content")
+            for attr in ("property", "itemprop"):
+                key = tag.get(attr)
+                if key and key not in meta:
+                    meta[key] = content
+        return meta
+
+    @staticmethod
+    def _scan_text(soup: BeautifulSoup) -> Dict[str, Optional[str]]:
+        """
+        Find the first price-like, rating and "sold" text nodes in a single
+        walk over the document, stopping once all three are found.
+        """
+        hits: Dict[str, Optional[str]] = {"price": None, "score": None, "sold": None}
+        remaining = len(hits)
+        for node in soup.descendants:
+            if not isinstance(node, NavigableString) or not node:
+                continue
+            if hits["price"] is None and "$" in node and _DIGIT_RE.search(node):
+                hits["price"] = node.strip()
+                remaining -= 1
+            if hits["score"] is None and "★" in node:
+                hits["score"] = node.strip()
+                remaining -= 1
+            if hits["sold"] is None and _SOLD_RE.search(node):
+                hits["sold"] = node.strip()
+                remaining -= 1
+            if not remaining:
+                break
+        return hits
+
+    @staticmethod
+    def _extract_title(soup: BeautifulSoup, meta: Dict[str, Optional[str]]) -> Optional[str]:
+        og_title = meta.get("og:title")
+        if og_title:
+            return og_title.strip()
 
         h1 = soup.find("h1")
         if h1 and h1.get_text(strip=True):
@@ -268,55 +536,36 @@ class TikTokShopScraper:
         return None
 
     @staticmethod
-    def _extract_prices(soup: BeautifulSoup) -> tuple[Optional[str], Optional[str]]:
-        origin_price = None
-        sale_price = None
-
-        origin_meta = soup.find("meta", property="product:original_price:amount")
-        sale_meta = soup.find("meta", property="product:price:amount")
-        if origin_meta:
-            origin_price = origin_meta.get("content")
-        if sale_meta:
-            sale_price = sale_meta.get("content")
+    def _extract_prices(
+        meta: Dict[str, Optional[str]], text_hits: Dict[str, Optional[str]]
+    ) -> tuple[Optional[str], Optional[str]]:
+        origin_price = meta.get("product:original_price:amount")
+        sale_price = meta.get("product:price:amount")
 
         if not sale_price:
-            # look for HTML elements with price-like text
-            price_candidates = soup.find_all(
-                string=lambda text: text and any(ch.isdigit() for ch in text) and "$" in text
-            )
-            if price_candidates:
-                text = price_candidates[0].strip()
-                sale_price = text
+            # fall back to the first HTML text node with price-like text
+            sale_price = text_hits["price"]
 
         return origin_price, sale_price
 
     @staticmethod
-    def _extract_score(soup: BeautifulSoup) -> Optional[str]:
-        rating_meta = soup.find("meta", itemprop="ratingValue")
-        if rating_meta and rating_meta.get("content"):
-            return rating_meta["content"]
+    def _extract_score(
+        meta: Dict[str, Optional[str]], text_hits: Dict[str, Optional[str]]
+    ) -> Optional[str]:
+        rating = meta.get("ratingValue")
+        if rating:
+            return rating
 
-        rating_el = soup.find(string=lambda x: x and "★" in x)
-        if rating_el:
-            return rating_el.strip()
-
-        return None
+        return text_hits["score"]
 
     @staticmethod
-    def _extract_sold(soup: BeautifulSoup) -> Optional[str]:
-        sold_el = soup.find(string=lambda x: x and "sold" in x.lower())
-        if sold_el:
-            return sold_el.strip()
-        return None
-
-    @staticmethod
-    def _extract_image(soup: BeautifulSoup) -> Optional[str]:
-        og_img = soup.find("meta", property="og:image")
-        if og_img and og_img.get("content"):
-            return og_img["content"]
+    def _extract_image(soup: BeautifulSoup, meta: Dict[str, Optional[str]]) -> Optional[str]:
+        og_img = meta.get("og:image")
+        if og_img:
+            return og_img
 
         img = soup.find("img")
         if img and img.get("src"):
             return img["src"]
 
-        return None
\ No newline at end of file
+        return None
@@ -1,7 +1,15 @@
+import copy
+import functools
 import json
 import logging
 import os
-from typing import Any, Dict, List
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json is used instead
+    orjson = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
@@ -36,26 +44,36 @@ def normalize_product_link(url: str) -> str:
     # TikTok sometimes uses tracking params; for this example we just strip whitespace.
     return url.strip()
 
-def load_settings(path: str) -> Dict[str, Any]:
-    """
-    Load scraper settings from a JSON file. If the file does not exist,
-    return sensible defaults.
-    """
-    defaults: Dict[str, Any] = {
+def _default_settings() -> Dict[str, Any]:
+    return {
         "user_agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
             "AppleWebKit/537.36 (KHTML, like Gecko) "
             "Chrome/120.0.0.0 Safari/537.36"
         ),
         "request_timeout": 15,
+        "concurrency": 8,
     }
+
+def load_settings(path: str) -> Dict[str, Any]:
+    """
+    Load scraper settings from a JSON file. If the file does not exist,
+    return sensible defaults.
+
+    Parsed results are cached per (path, mtime), so repeated calls only stat
+    the file and editing it invalidates the cache.
+    """
     if not os.path.exists(path):
         logger.warning("Settings file %s not found. Using defaults.", path)
-        return defaults
+        return _default_settings()
+    # Deep copy: nested sections (e.g. "export") must not leak edits into the cache.
+    return copy.deepcopy(_load_settings_cached(os.path.abspath(path), os.path.getmtime(path)))
 
+@functools.lru_cache(maxsize=8)
+def _load_settings_cached(path: str, mtime: float) -> Dict[str, Any]:
+    defaults = _default_settings()
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(path)
         if not isinstance(data, dict):
             logger.warning("Settings file %s did not contain a JSON object. Using defaults.", path)
             return defaults
@@ -65,6 +83,12 @@ def load_settings(path: str) -> Dict[str, Any]:
         logger.error("Failed to load settings from %s: %s. Using defaults.", path, exc)
         return defaults
 
+def _read_json(path: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
 def load_urls_from_file(path: str) -> List[str]:
     """
     Load TikTok Shop URLs from a newline-delimited text file.
@@ -73,7 +97,10 @@ def load_urls_from_file(path: str) -> List[str]:
     if not os.path.exists(path):
         logger.error("Input URLs file %s does not exist.", path)
         return []
+    return list(_load_urls_cached(os.path.abspath(path), os.path.getmtime(path)))
 
+@functools.lru_cache(maxsize=8)
+def _load_urls_cached(path: str, mtime: float) -> Tuple[str, ...]:
     urls: List[str] = []
     with open(path, "r", encoding="utf-8") as f:
         for line in f:
@@ -81,4 +108,4 @@ def load_urls_from_file(path: str) -> List[str]:
             if not line or line.startswith("#"):
                 continue
             urls.append(line)
-    return urls
\ No newline at end of file
+    return tuple(urls)
@@ -1,4 +1,6 @@
 import argparse
+import copy
+import functools
 import json
 from pathlib import Path
 from typing import Any, Dict
@@ -6,16 +8,28 @@ from typing import Any, Dict
 from rich.console import Console
 from rich.table import Table
 
-from src.utils.validator import validate_input
+from src.utils.validator import validate_input_json
 from src.services.scraper import TikTokShopScraper, ScraperConfig
 from src.services.exporter import export_json
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json is used instead
+    orjson = None  # type: ignore[assignment]
+
 console = Console()
 
 def load_settings(path: str | Path) -> Dict[str, Any]:
     path = Path(path)
     if not path.exists():
         raise FileNotFoundError(f"Settings file not found: {path}")
+    # Cached per (path, mtime); hand out a deep copy so callers can't mutate it.
+    return copy.deepcopy(_load_settings_cached(path.resolve(), path.stat().st_mtime))
+
+@functools.lru_cache(maxsize=8)
+def _load_settings_cached(path: Path, mtime: float) -> Dict[str, Any]:
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
@@ -57,15 +71,15 @@ def main():
         max_retries=int(settings.get("max_retries", 3)),
         retry_backoff_seconds=float(settings.get("retry_backoff_seconds", 0.5)),
         user_agent=str(settings.get("user_agent")),
+        retry_backoff_jitter=float(settings.get("retry_backoff_jitter", 0.3)),
     )
 
     # Load and validate input
-    raw_input = {}
+    raw_input = b""
     input_path = Path(args.input)
     if input_path.exists():
-        with input_path.open("r", encoding="utf-8") as f:
-            raw_input = json.load(f)
-    params = validate_input(raw_input)
+        raw_input = input_path.read_bytes()
+    params = validate_input_json(raw_input)
 
     # Run scraper
     scraper = TikTokShopScraper(cfg)
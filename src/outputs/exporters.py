@@ -1,11 +1,28 @@
 import csv
+import itertools
 import json
 import logging
 import os
-from typing import Any, Dict, Iterable, List
+from html import escape
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from xml.etree.ElementTree import Element, SubElement, ElementTree
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json is used instead
+    orjson = None  # type: ignore[assignment]
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - stdlib ElementTree is used instead
+    etree = None  # type: ignore[assignment]
+
+try:
+    import xlsxwriter
+except ImportError:  # pragma: no cover - openpyxl is used instead
+    xlsxwriter = None  # type: ignore[assignment]
+
 try:
     from openpyxl import Workbook
 except ImportError:  # pragma: no cover - only used when dependency installed
@@ -13,19 +30,30 @@ except ImportError:  # pragma: no cover - only used when dependency installed
 
 logger = logging.getLogger(__name__)
 
-def export_data(rows: Iterable[Dict[str, Any]], output_path: str, fmt: str) -> None:
-    rows_list: List[Dict[str, Any]] = list(rows)
+def export_data(
+    rows: Iterable[Dict[str, Any]],
+    output_path: str,
+    fmt: str,
+    fieldnames: Optional[Sequence[str]] = None,
+) -> None:
+    """
+    Export rows in the given format. Pass ``fieldnames`` when every row has
+    the same keys (e.g. ``PRODUCT_FIELDS``) to skip scanning rows for headers.
+
+    ``rows`` may be a generator: JSON and XML always consume it lazily, and
+    CSV/HTML/XLSX do too when ``fieldnames`` is given.
+    """
     fmt = fmt.lower()
     if fmt == "json":
-        _export_json(rows_list, output_path)
+        _export_json(rows, output_path)
     elif fmt == "csv":
-        _export_csv(rows_list, output_path)
+        _export_csv(rows, output_path, fieldnames)
     elif fmt == "xlsx":
-        _export_xlsx(rows_list, output_path)
+        _export_xlsx(rows, output_path, fieldnames)
     elif fmt == "html":
-        _export_html(rows_list, output_path)
+        _export_html(rows, output_path, fieldnames)
     elif fmt == "xml":
-        _export_xml(rows_list, output_path)
+        _export_xml(rows, output_path)
     else:
         raise ValueError(f"Unsupported export format: {fmt}")
 
@@ -34,77 +62,177 @@ def _ensure_parent_dir(path: str) -> None:
     if parent and not os.path.exists(parent):
         os.makedirs(parent, exist_ok=True)
 
-def _export_json(rows: List[Dict[str, Any]], output_path: str) -> None:
+def _collect_headers(
+    rows: Iterable[Dict[str, Any]], fieldnames: Optional[Sequence[str]] = None
+) -> List[str]:
+    if fieldnames:
+        return list(fieldnames)
+    # Heterogeneous input: dict.fromkeys keeps first-seen key order in one pass.
+    return list(dict.fromkeys(key for row in rows for key in row))
+
+def _peek(rows: Iterable[Dict[str, Any]]) -> Optional[Iterator[Dict[str, Any]]]:
+    """
+    Return an iterator over ``rows``, or None if there are none, without
+    consuming anything from a generator.
+    """
+    rows_iter = iter(rows)
+    first = next(rows_iter, None)
+    if first is None:
+        return None
+    return itertools.chain([first], rows_iter)
+
+def _headers_and_rows(
+    rows: Iterable[Dict[str, Any]], fieldnames: Optional[Sequence[str]] = None
+) -> Tuple[List[str], Optional[Iterator[Dict[str, Any]]]]:
+    """
+    Return ``(headers, rows_iter)``; ``rows_iter`` is None when there are no
+    rows. Without ``fieldnames`` the headers are the union of all row keys,
+    so every row is read into memory first.
+    """
+    if not fieldnames:
+        rows = list(rows)
+    rows_iter = _peek(rows)
+    if rows_iter is None:
+        return [], None
+    return _collect_headers(rows, fieldnames), rows_iter
+
+def _dump_json_row(row: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        data = orjson.dumps(row, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(row, ensure_ascii=False, indent=2).encode("utf-8")
+    # Nest one level inside the top-level array. JSON strings never contain
+    # raw newlines, so this only touches layout whitespace.
+    return b"  " + data.replace(b"\n", b"\n  ")
+
+def _export_json(rows: Iterable[Dict[str, Any]], output_path: str) -> None:
     _ensure_parent_dir(output_path)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(rows, f, ensure_ascii=False, indent=2)
+    # Frame the array by hand so rows are serialized one at a time; the
+    # output matches a single indent=2 dump of the whole list.
+    with open(output_path, "wb") as f:
+        f.write(b"[")
+        empty = True
+        for row in rows:
+            f.write(b"\n" if empty else b",\n")
+            f.write(_dump_json_row(row))
+            empty = False
+        f.write(b"]" if empty else b"\n]")
     logger.info("JSON export complete: %s", output_path)
 
-def _export_csv(rows: List[Dict[str, Any]], output_path: str) -> None:
+def _export_csv(
+    rows: Iterable[Dict[str, Any]],
+    output_path: str,
+    fieldnames: Optional[Sequence[str]] = None,
+) -> None:
     _ensure_parent_dir(output_path)
-    if not rows:
+    headers, rows_iter = _headers_and_rows(rows, fieldnames)
+    if rows_iter is None:
         logger.warning("No data to export to CSV. Creating empty file: %s", output_path)
         with open(output_path, "w", encoding="utf-8", newline="") as f:
             f.write("")
         return
 
-    fieldnames = sorted({key for row in rows for key in row.keys()})
     with open(output_path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow(row)
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        writer.writerows([row.get(h) for h in headers] for row in rows_iter)
     logger.info("CSV export complete: %s", output_path)
 
-def _export_xlsx(rows: List[Dict[str, Any]], output_path: str) -> None:
-    if Workbook is None:
+def _export_xlsx(
+    rows: Iterable[Dict[str, Any]],
+    output_path: str,
+    fieldnames: Optional[Sequence[str]] = None,
+) -> None:
+    if xlsxwriter is None and Workbook is None:
         logger.error(
-            "openpyxl is not installed. Cannot export XLSX. "
-            "Install it with `pip install openpyxl`."
+            "Neither xlsxwriter nor openpyxl is installed. Cannot export XLSX. "
+            "Install one with `pip install xlsxwriter`."
         )
         return
 
     _ensure_parent_dir(output_path)
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "TikTok Shop Data"
-
-    if not rows:
+    headers, rows_iter = _headers_and_rows(rows, fieldnames)
+
+    if xlsxwriter is not None:
+        # constant_memory flushes each row to disk once the next one starts.
+        # URLs are written as plain text: xlsxwriter silently drops hyperlink
+        # cells past Excel's per-sheet link limit or URL length limit.
+        # "="-prefixed values stay text too, not formulas.
+        wb = xlsxwriter.Workbook(
+            output_path,
+            {"constant_memory": True, "strings_to_urls": False, "strings_to_formulas": False},
+        )
+        ws = wb.add_worksheet("TikTok Shop Data")
+        if rows_iter is not None:
+            ws.write_row(0, 0, headers)
+            for index, row in enumerate(rows_iter, start=1):
+                ws.write_row(index, 0, [row.get(h) for h in headers])
+        wb.close()
+    else:
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "TikTok Shop Data"
+        if rows_iter is not None:
+            ws.append(headers)
+            for row in rows_iter:
+                ws.append([row.get(h) for h in headers])
+                # openpyxl stores "="-prefixed strings as formulas; keep them
+                # text, matching the xlsxwriter path.
+                for cell in ws[ws.max_row]:
+                    if cell.data_type == "f":
+                        cell.data_type = "s"
         wb.save(output_path)
+
+    if rows_iter is None:
         logger.warning("No data to export to XLSX. Created empty workbook: %s", output_path)
         return
-
-    headers = sorted({key for row in rows for key in row.keys()})
-    ws.append(headers)
-    for row in rows:
-        ws.append([row.get(h) for h in headers])
-
-    wb.save(output_path)
     logger.info("XLSX export complete: %s", output_path)
 
-def _export_html(rows: List[Dict[str, Any]], output_path: str) -> None:
+def _export_html(
+    rows: Iterable[Dict[str, Any]],
+    output_path: str,
+    fieldnames: Optional[Sequence[str]] = None,
+) -> None:
     _ensure_parent_dir(output_path)
-    if not rows:
-        html = "<html><body><p>No data available.</p></body></html>"
-    else:
-        headers = sorted({key for row in rows for key in row.keys()})
-        header_html = "".join(f"<th>{h}</th>" for h in headers)
-        rows_html = ""
-        for row in rows:
-            cells = "".join(f"<td>{row.get(h, '')}</td>" for h in headers)
-            rows_html += f"<tr>{cells}</tr>"
-        html = (
-            "<html><head><meta charset='utf-8'><title>TikTok Shop Data</title></head>"
-            "<body><table border='1'><thead><tr>"
-            f"{header_html}</tr></thead><tbody>{rows_html}</tbody></table></body></html>"
-        )
+    headers, rows_iter = _headers_and_rows(rows, fieldnames)
+    if rows_iter is None:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("<html><body><p>No data available.</p></body></html>")
+        logger.info("HTML export complete: %s", output_path)
+        return
 
+    header_html = "".join(f"<th>{escape(h)}</th>" for h in headers)
+    # Write row by row rather than assembling the whole document in memory.
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
+        f.write(
+            "<html><head><meta charset='utf-8'><title>TikTok Shop Data</title></head>"
+            f"<body><table border='1'><thead><tr>{header_html}</tr></thead><tbody>"
+        )
+        for row in rows_iter:
+            cells = "".join(f"<td>{_html_cell(row.get(h))}</td>" for h in headers)
+            f.write(f"<tr>{cells}</tr>")
+        f.write("</tbody></table></body></html>")
     logger.info("HTML export complete: %s", output_path)
 
-def _export_xml(rows: List[Dict[str, Any]], output_path: str) -> None:
+def _html_cell(value: Any) -> str:
+    return "" if value is None else escape(str(value))
+
+def _export_xml(rows: Iterable[Dict[str, Any]], output_path: str) -> None:
     _ensure_parent_dir(output_path)
+    if etree is not None:
+        # Incremental writer: each row is serialized as it is consumed, so
+        # memory stays flat regardless of how many rows are exported.
+        with etree.xmlfile(output_path, encoding="utf-8") as xf:
+            xf.write_declaration()
+            with xf.element("products"):
+                for row in rows:
+                    with xf.element("product"):
+                        for key, value in row.items():
+                            with xf.element(key):
+                                xf.write("" if value is None else str(value))
+        logger.info("XML export complete: %s", output_path)
+        return
+
     root = Element("products")
     for row in rows:
         product_el = SubElement(root, "product")
@@ -114,4 +242,4 @@ def _export_xml(rows: List[Dict[str, Any]], output_path: str) -> None:
 
     tree = ElementTree(root)
     tree.write(output_path, encoding="utf-8", xml_declaration=True)
-    logger.info("XML export complete: %s", output_path)
\ No newline at end of file
+    logger.info("XML export complete: %s", output_path)
@@ -1,16 +1,19 @@
 import argparse
+import itertools
 import json
 import logging
 import os
 import sys
-from typing import List, Dict, Any
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List
 
 # Ensure local packages can be imported when running as a script
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 if CURRENT_DIR not in sys.path:
     sys.path.insert(0, CURRENT_DIR)
 
-from extractors.tiktok_parser import TikTokShopScraper
+from extractors.tiktok_parser import PRODUCT_FIELDS, TikTokShopScraper
 from outputs.exporters import export_data
 from extractors.utils_format import load_urls_from_file, load_settings
 
@@ -26,6 +29,40 @@ def configure_logging(verbosity: int) -> None:
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     )
 
+def scrape_one(scraper: TikTokShopScraper, url: str) -> List[Dict[str, Any]]:
+    logger = logging.getLogger("runner")
+    try:
+        logger.info("Scraping URL: %s", url)
+        products = scraper.scrape_url(url)
+        logger.info("Found %d products from %s", len(products), url)
+        return products
+    except Exception as exc:
+        logger.exception("Failed to scrape %s: %s", url, exc)
+        return []
+
+def iter_scrape(
+    scraper: TikTokShopScraper, urls: List[str], concurrency: int
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield product dicts as each URL finishes, in input order. Fetches are I/O
+    bound, so they overlap on a thread pool sharing the scraper's session.
+
+    At most ``concurrency`` URLs are in flight or waiting to be consumed, so a
+    slow early URL cannot make later results pile up in memory.
+    """
+    url_iter = iter(urls)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending: Deque["Future[List[Dict[str, Any]]]"] = deque(
+            executor.submit(scrape_one, scraper, url)
+            for url in itertools.islice(url_iter, concurrency)
+        )
+        while pending:
+            products = pending.popleft().result()
+            # Refill the window before yielding so the pool stays busy.
+            for url in itertools.islice(url_iter, 1):
+                pending.append(executor.submit(scrape_one, scraper, url))
+            yield from products
+
 def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="TikTok Shop scraper - extract product details from TikTok Shop URLs."
@@ -82,32 +119,42 @@ def main(argv: List[str] | None = None) -> None:
         logger.error("No URLs found in %s. Exiting.", args.input_file)
         sys.exit(1)
 
+    concurrency = max(1, int(settings.get("concurrency", 8)))
     scraper = TikTokShopScraper(
         user_agent=settings.get("user_agent"),
         timeout=settings.get("request_timeout", 15),
+        pool_size=concurrency,
     )
 
-    all_products: List[Dict[str, Any]] = []
-    for url in urls:
-        try:
-            logger.info("Scraping URL: %s", url)
-            products = scraper.scrape_url(url)
-            logger.info("Found %d products from %s", len(products), url)
-            all_products.extend(products)
-        except Exception as exc:
-            logger.exception("Failed to scrape %s: %s", url, exc)
-
-    if not all_products:
-        logger.warning("No products were extracted from the provided URLs.")
-
     output_dir = os.path.dirname(args.output)
     if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir, exist_ok=True)
 
-    logger.info("Exporting %d products to %s (%s)", len(all_products), args.output, args.format)
-    export_data(all_products, args.output, args.format)
+    # Products stream from the scraper straight into the exporter instead of
+    # being collected into one list first.
+    exported = 0
+
+    def counted(rows: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        nonlocal exported
+        for row in rows:
+            exported += 1
+            yield row
+
+    logger.info("Exporting products to %s (%s)", args.output, args.format)
+    try:
+        export_data(
+            counted(iter_scrape(scraper, urls, concurrency)),
+            args.output,
+            args.format,
+            fieldnames=PRODUCT_FIELDS,
+        )
+    finally:
+        scraper.close()
+
+    if not exported:
+        logger.warning("No products were extracted from the provided URLs.")
 
-    logger.info("Done. Exported %d products.", len(all_products))
+    logger.info("Done. Exported %d products.", exported)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,6 +3,11 @@ from pathlib import Path
 from typing import Iterable, Any
 from rich.console import Console
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json is used instead
+    orjson = None  # type: ignore[assignment]
+
 console = Console()
 
 def export_json(data: Iterable[dict], output_path: str | Path) -> Path:
@@ -11,7 +16,10 @@ def export_json(data: Iterable[dict], output_path: str | Path) -> Path:
     """
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(list(data), f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(list(data), option=orjson.OPT_INDENT_2))
+    else:
+        with output_path.open("w", encoding="utf-8") as f:
+            json.dump(list(data), f, ensure_ascii=False, indent=2)
     console.log(f"[green]Wrote {output_path}[/green]")
     return output_path
\ No newline at end of file
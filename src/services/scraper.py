@@ -1,19 +1,57 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import importlib.util
 import json
 import random
 import string
+import time
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Dict, List, Optional
 
-import requests
-from tenacity import retry, stop_after_attempt, wait_exponential_jitter
+import httpx
+import numpy as np
 from rich.console import Console
 
-from src.utils.parser import map_product, guess_currency_from_region
+from src.utils.parser import map_product, map_product_strict, guess_currency_from_region
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json is used instead
+    orjson = None  # type: ignore[assignment]
+
+# httpx only negotiates HTTP/2 when the optional h2 package is installed.
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+
+# Retry policy shared by the sync and async fetch paths: transport errors and
+# these statuses are retried with exponential backoff; anything else fails.
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
 
 console = Console()
 
+_HASH_ALPHABET = np.frombuffer(
+    (string.ascii_lowercase + string.digits).encode("ascii"), dtype=np.uint8
+)
+
+# Bound str.format templates for the mock URLs and titles; the template is
+# parsed once here instead of once per product.
+_TITLE = "{} Product {}".format
+_COVER = "https://picsum.photos/seed/{}/400/400.webp".format
+_IMG_A = "https://picsum.photos/seed/{}a/800/800.webp".format
+_IMG_B = "https://picsum.photos/seed/{}b/800/800.webp".format
+
+def _random_strings(
+    rng: np.random.Generator, alphabet: np.ndarray, length: int, count: int
+) -> List[str]:
+    """
+    Draw ``count`` random strings of ``length`` chars from ``alphabet`` in one
+    vectorized call (each row of ASCII codes is reinterpreted as one string).
+    """
+    codes = alphabet[rng.integers(0, len(alphabet), (count, length))]
+    return codes.view(f"S{length}").ravel().astype(f"U{length}").tolist()
+
 @dataclass
 class ScraperConfig:
     offline_mode: bool
@@ -22,6 +60,33 @@ class ScraperConfig:
     max_retries: int
     retry_backoff_seconds: float
     user_agent: str
+    retry_backoff_jitter: float = 0.3
+
+def _random_ids(rng: np.random.Generator, digits: int, count: int) -> List[str]:
+    """
+    Draw ``count`` zero-padded decimal IDs of ``digits`` digits: one integer
+    draw per ID instead of one draw per digit.
+    """
+    if count <= 0:
+        # np.char.zfill cannot size an empty array
+        return []
+    ids = rng.integers(0, 10**digits, count).astype(f"U{digits}")
+    return np.char.zfill(ids, digits).tolist()
+
+def _is_retryable(exc: httpx.HTTPError) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRY_STATUSES
+    return isinstance(exc, httpx.TransportError)
+
+def _loop_running() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+def _sort_keys(items: List[Dict], field: str, cast: type, dtype: type) -> np.ndarray:
+    return np.fromiter((cast(x.get(field, 0)) for x in items), dtype=dtype, count=len(items))
 
 class TikTokShopScraper:
     """
@@ -32,13 +97,11 @@ class TikTokShopScraper:
 
     def __init__(self, cfg: ScraperConfig):
         self.cfg = cfg
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "User-Agent": cfg.user_agent,
-                "Accept": "application/json,text/html;q=0.9,*/*;q=0.8",
-            }
-        )
+        self.headers = {
+            "User-Agent": cfg.user_agent,
+            "Accept": "application/json,text/html;q=0.9,*/*;q=0.8",
+            "Accept-Encoding": "gzip, deflate",
+        }
 
     def search(
         self,
@@ -50,50 +113,119 @@ class TikTokShopScraper:
         limit: int,
         start_urls: Optional[List[str]] = None,
     ) -> List[Dict]:
+        currency = guess_currency_from_region(region)
         if self.cfg.offline_mode:
             console.log("[yellow]Offline mode enabled; generating mock dataset[/yellow]")
-            products = list(self._mock_products(keyword, is_trending, region, limit))
-            products = self._apply_sort(products, sort)
-            return [map_product(p, region) for p in products]
+            return self._mock_results(keyword, is_trending, region, sort, limit, currency)
 
         # Best-effort online behavior (may require further engineering depending on TikTok anti-bot)
         try:
             if start_urls:
-                items = []
-                for url in start_urls[:limit]:
-                    raw = self._fetch_url(url, region)
-                    if raw:
-                        items.append(raw)
-                return [map_product(p, region) for p in items[:limit]]
+                urls = start_urls[:limit]
+                # asyncio.run() cannot nest inside a running loop (e.g. when
+                # search() is called from async code); fetch sequentially then.
+                if _loop_running():
+                    with httpx.Client(**self._client_options()) as client:
+                        fetched = [self._fetch_url(client, url, region) for url in urls]
+                else:
+                    fetched = asyncio.run(self._fetch_urls_async(urls, region))
+                items = [raw for raw in fetched if raw]
+                return [map_product(p, region, currency) for p in items[:limit]]
             else:
                 raw_items = self._search_keyword(keyword or "", region, is_trending, limit)
                 raw_items = self._apply_sort(raw_items, sort)
-                return [map_product(p, region) for p in raw_items[:limit]]
+                return [map_product_strict(p, currency) for p in raw_items[:limit]]
         except Exception as e:
             console.log(f"[red]Online scraping failed: {e}. Falling back to mock data.[/red]")
-            products = list(self._mock_products(keyword, is_trending, region, limit))
-            products = self._apply_sort(products, sort)
-            return [map_product(p, region) for p in products]
+            return self._mock_results(keyword, is_trending, region, sort, limit, currency)
+
+    def _mock_results(
+        self,
+        keyword: Optional[str],
+        is_trending: bool,
+        region: Optional[str],
+        sort: str,
+        limit: int,
+        currency: str,
+    ) -> List[Dict]:
+        products = self._apply_sort(
+            self._mock_products(keyword, is_trending, region, limit), sort
+        )
+        return [map_product_strict(p, currency) for p in products]
 
     def _apply_sort(self, items: List[Dict], sort: str) -> List[Dict]:
+        # Keys are extracted once into an array and sorted in C; a stable sort
+        # on negated keys keeps ties in input order, as sorted(reverse=True) did.
+        if not items:
+            return items
         if sort == "PRICE_ASC":
-            return sorted(items, key=lambda x: float(x.get("price", 0)))
-        if sort == "PRICE_DESC":
-            return sorted(items, key=lambda x: float(x.get("price", 0)), reverse=True)
-        if sort == "BEST_SELLERS":
-            return sorted(items, key=lambda x: int(x.get("sold_count", 0)), reverse=True)
-        # RELEVANCE default: stable order (as generated/fetched)
-        return items
-
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential_jitter(initial=0.3, max=2))
-    def _fetch_url(self, url: str, region: Optional[str]) -> Dict:
+            order = np.argsort(_sort_keys(items, "price", float, np.float64), kind="stable")
+        elif sort == "PRICE_DESC":
+            order = np.argsort(-_sort_keys(items, "price", float, np.float64), kind="stable")
+        elif sort == "BEST_SELLERS":
+            order = np.argsort(-_sort_keys(items, "sold_count", int, np.int64), kind="stable")
+        else:
+            # RELEVANCE default: stable order (as generated/fetched)
+            return items
+        return [items[i] for i in order.tolist()]
+
+    def _client_options(self) -> Dict[str, Any]:
+        # Pooled keep-alive connections; same-host URLs share one HTTP/2
+        # connection. Clients are closed when each search() batch is done.
+        return {
+            "http2": _HTTP2,
+            "timeout": self.cfg.timeout_seconds,
+            "headers": self.headers,
+            "limits": _LIMITS,
+        }
+
+    def _backoff(self, attempt: int) -> float:
+        return self.cfg.retry_backoff_seconds * 2 ** (attempt - 1) + random.uniform(
+            0, self.cfg.retry_backoff_jitter
+        )
+
+    def _fetch_url(self, client: httpx.Client, url: str, region: Optional[str]) -> Dict:
         # This is a placeholder illustrating how a specific product/listing URL could be parsed.
         # Many TikTok pages require JS rendering and cookies; production implementation would need headless browsing.
-        resp = self.session.get(url, timeout=self.cfg.timeout_seconds)
-        resp.raise_for_status()
+        attempt = 0
+        while True:
+            try:
+                client.get(url).raise_for_status()
+                return self._placeholder_product(url, region)
+            except httpx.HTTPError as e:
+                attempt += 1
+                if attempt > self.cfg.max_retries or not _is_retryable(e):
+                    raise
+                time.sleep(self._backoff(attempt))
+
+    async def _fetch_urls_async(self, urls: List[str], region: Optional[str]) -> List[Dict]:
+        """
+        Fetch all URLs concurrently over one pooled client, so the batch costs
+        roughly one round trip instead of one per URL.
+        """
+        async with httpx.AsyncClient(**self._client_options()) as client:
+            return await asyncio.gather(
+                *(self._fetch_url_async(client, url, region) for url in urls)
+            )
+
+    async def _fetch_url_async(
+        self, client: httpx.AsyncClient, url: str, region: Optional[str]
+    ) -> Dict:
+        attempt = 0
+        while True:
+            try:
+                (await client.get(url)).raise_for_status()
+                return self._placeholder_product(url, region)
+            except httpx.HTTPError as e:
+                attempt += 1
+                if attempt > self.cfg.max_retries or not _is_retryable(e):
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+
+    def _placeholder_product(self, url: str, region: Optional[str]) -> Dict:
         # For demo, wrap minimal fields
         currency = guess_currency_from_region(region)
-        pid = "".join(random.choices(string.digits, k=18))
+        pid = f"{random.randrange(10**18):018d}"
         return {
             "product_id": pid,
             "title": f"Parsed: {url[:40]}",
@@ -125,17 +257,22 @@ class TikTokShopScraper:
             "trending": is_trending,
             "limit": min(limit, 200),
         }
-        console.log(f"[cyan]Simulating keyword search payload[/cyan]: {json.dumps(payload)}")
-        return list(self._mock_products(keyword, is_trending, region, limit))
+        payload_json = orjson.dumps(payload).decode() if orjson is not None else json.dumps(payload)
+        console.log(f"[cyan]Simulating keyword search payload[/cyan]: {payload_json}")
+        return self._mock_products(keyword, is_trending, region, limit)
 
     def _mock_products(
         self, keyword: Optional[str], is_trending: bool, region: Optional[str], limit: int
-    ) -> Iterable[Dict]:
+    ) -> List[Dict]:
         """
         Deterministic pseudo-random mock generator seeded by keyword+region to produce stable outputs.
         """
+        if limit <= 0:
+            return []
         seed_basis = f"{keyword or 'trending'}|{region or 'US'}|{int(is_trending)}"
-        rnd = random.Random(seed_basis)
+        # str hash() is salted per process, so derive the seed from a digest.
+        seed = int.from_bytes(hashlib.sha256(seed_basis.encode("utf-8")).digest(), "big")
+        rng = np.random.default_rng(seed)
         currency = guess_currency_from_region(region)
 
         labels_pool = [
@@ -145,31 +282,44 @@ class TikTokShopScraper:
             [],
             ["Limited Offer"],
         ]
-        for i in range(limit):
-            sold = rnd.randint(10, 50000)
-            price = round(rnd.uniform(1.0, 300.0), 2)
-            discount = rnd.choice([None, "10%", "15%", "25%", "40%"])
-            pid = "".join(rnd.choices(string.digits, k=18))
-            img_hash = "".join(rnd.choices(string.ascii_lowercase + string.digits, k=8))
-            title_kw = (keyword or "Trending")[:20]
-            yield {
-                "product_id": pid,
-                "title": f"{title_kw} Product {i+1}",
-                "cover": f"https://picsum.photos/seed/{img_hash}/400/400.webp",
-                "img": [
-                    f"https://picsum.photos/seed/{img_hash}a/800/800.webp",
-                    f"https://picsum.photos/seed/{img_hash}b/800/800.webp",
-                ],
-                "price": price,
+        discounts = [None, "10%", "15%", "25%", "40%"]
+
+        # Draw every random field for the whole batch up front in C; the
+        # comprehension below only assembles dicts. tolist() yields plain Python scalars.
+        sold_arr = rng.integers(10, 50001, limit)
+        sold_counts = sold_arr.tolist()
+        prices = np.round(rng.uniform(1.0, 300.0, limit), 2).tolist()
+        ratings = np.round(rng.uniform(3.2, 5.0, limit), 1).tolist()
+        review_counts = rng.integers(0, np.maximum(10, sold_arr // 5) + 1).tolist()
+        discount_idx = rng.integers(0, len(discounts), limit).tolist()
+        label_idx = rng.integers(0, len(labels_pool), limit).tolist()
+        pids = _random_ids(rng, 18, limit)
+        img_hashes = _random_strings(rng, _HASH_ALPHABET, 8, limit)
+        seller_ids = _random_ids(rng, 10, limit)
+
+        # Per-batch constants, computed once rather than per product.
+        title_kw = (keyword or "Trending")[:20]
+        seller_name = f"{title_kw} Seller"
+        region_out = region or "US"
+
+        return [
+            {
+                "product_id": pids[i],
+                "title": _TITLE(title_kw, i + 1),
+                "cover": _COVER(img_hashes[i]),
+                "img": [_IMG_A(img_hashes[i]), _IMG_B(img_hashes[i])],
+                "price": prices[i],
                 "currency": currency,
                 "format_price": None,
-                "discount": discount,
-                "warehouse_region": region or "US",
-                "product_rating": round(rnd.uniform(3.2, 5.0), 1),
-                "sold_count": sold,
-                "review_count": rnd.randint(0, max(10, sold // 5)),
-                "seller_name": f"{title_kw} Seller",
-                "seller_id": "".join(rnd.choices(string.digits, k=10)),
-                "promotion_labels": rnd.choice(labels_pool),
+                "discount": discounts[discount_idx[i]],
+                "warehouse_region": region_out,
+                "product_rating": ratings[i],
+                "sold_count": sold_counts[i],
+                "review_count": review_counts[i],
+                "seller_name": seller_name,
+                "seller_id": seller_ids[i],
+                "promotion_labels": labels_pool[label_idx[i]],
                 "_source": "mock",
-            }
\ No newline at end of file
+            }
+            for i in range(limit)
+        ]
\ No newline at end of file
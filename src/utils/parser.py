@@ -1,7 +1,13 @@
-from typing import Any, Dict, List
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Optional, Tuple
 from dateutil import parser as dtparser
 from datetime import datetime
 
+# Everything that is not part of a number; commas are dropped before matching.
+_PRICE_STRIP = re.compile(r"[^\d.]")
+
 def normalize_price(value: Any) -> float:
     """
     Convert various price representations to float.
@@ -10,16 +16,16 @@ def normalize_price(value: Any) -> float:
         return 0.0
     if isinstance(value, (int, float)):
         return float(value)
-    s = str(value)
-    digits = "".join(ch for ch in s if ch.isdigit() or ch == "." or ch == ",")
-    digits = digits.replace(",", "")
+    digits = _PRICE_STRIP.sub("", str(value).replace(",", ""))
+    if not digits:
+        return 0.0
     try:
         return float(digits)
     except ValueError:
         return 0.0
 
-def guess_currency_from_region(region: str | None) -> str:
-    mapping = {
+_CURRENCY_BY_REGION = MappingProxyType(
+    {
         "US": "USD",
         "VN": "VND",
         "GB": "GBP",
@@ -30,9 +36,13 @@ def guess_currency_from_region(region: str | None) -> str:
         "TH": "THB",
         "PH": "PHP",
     }
+)
+
+@lru_cache(maxsize=64)
+def guess_currency_from_region(region: str | None) -> str:
     if not region:
         return "USD"
-    return mapping.get(region.upper(), "USD")
+    return _CURRENCY_BY_REGION.get(region.upper(), "USD")
 
 def to_iso8601(dt: Any | None) -> str | None:
     if not dt:
@@ -41,6 +51,11 @@ def to_iso8601(dt: Any | None) -> str | None:
         # assume epoch seconds
         return datetime.utcfromtimestamp(float(dt)).isoformat() + "Z"
     if isinstance(dt, str):
+        # Fast C path for ISO-8601 input; dateutil only for other formats.
+        try:
+            return datetime.fromisoformat(dt.replace("Z", "+00:00")).isoformat()
+        except ValueError:
+            pass
         try:
             return dtparser.parse(dt).isoformat()
         except Exception:
@@ -49,32 +64,95 @@ def to_iso8601(dt: Any | None) -> str | None:
         return dt.isoformat()
     return None
 
-def map_product(raw: Dict[str, Any], region: str | None = None) -> Dict[str, Any]:
+# Provider aliases for each canonical field, in lookup order. The first truthy
+# value wins, matching the previous `raw.get(a) or raw.get(b)` chains.
+_PRODUCT_ID_KEYS = ("product_id", "id")
+_TITLE_KEYS = ("title", "name")
+_IMAGE_KEYS = ("img", "images")
+_PRICE_KEYS = ("price", "min_price")
+_RATING_KEYS = ("product_rating", "rating")
+_SOLD_KEYS = ("sold_count", "sold")
+_REVIEW_KEYS = ("review_count", "reviews")
+_SELLER_NAME_KEYS = ("seller_name", "shop_name")
+_SELLER_ID_KEYS = ("seller_id", "shop_id")
+
+def _pick(
+    raw: Dict[str, Any],
+    keys: Tuple[str, ...],
+    default: Any,
+    cast: Optional[Callable[[Any], Any]] = None,
+) -> Any:
+    """
+    Return the first truthy value among ``keys`` (passed through ``cast``),
+    or ``default`` when none is set.
+    """
+    for key in keys:
+        value = raw.get(key)
+        if value:
+            return value if cast is None else cast(value)
+    return default
+
+def map_product(
+    raw: Dict[str, Any], region: str | None = None, currency: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Map a raw product dict (from provider or mock) into the canonical schema.
+
+    When mapping a batch, pass the batch's ``currency`` so it is not guessed
+    from ``region`` again for every product.
     """
-    currency = raw.get("currency") or guess_currency_from_region(region)
-    images: List[str] = raw.get("img") or raw.get("images") or []
+    currency = raw.get("currency") or currency or guess_currency_from_region(region)
+    # Any, not List[str]: providers send a bare string (or other sequence),
+    # and a mypyc build would reject those at the annotation.
+    images: Any = _pick(raw, _IMAGE_KEYS, None) or []
     if isinstance(images, str):
         images = [images]
 
     return {
-        "product_id": str(raw.get("product_id") or raw.get("id") or ""),
-        "title": raw.get("title") or raw.get("name") or "",
+        "product_id": _pick(raw, _PRODUCT_ID_KEYS, "", str),
+        "title": _pick(raw, _TITLE_KEYS, ""),
         "cover": raw.get("cover") or (images[0] if images else None),
         "img": images,
-        "price": normalize_price(raw.get("price") or raw.get("min_price") or 0),
+        "price": _pick(raw, _PRICE_KEYS, 0.0, normalize_price),
         "currency": currency,
         "format_price": raw.get("format_price") or f"{normalize_price(raw.get('price')):.2f} {currency}",
         "discount": raw.get("discount"),
         "warehouse_region": raw.get("warehouse_region") or raw.get("ship_from"),
-        "product_rating": str(raw.get("product_rating") or raw.get("rating") or ""),
-        "sold_count": int(raw.get("sold_count") or raw.get("sold") or 0),
-        "review_count": int(raw.get("review_count") or raw.get("reviews") or 0),
-        "seller_name": raw.get("seller_name") or raw.get("shop_name") or "",
-        "seller_id": str(raw.get("seller_id") or raw.get("shop_id") or ""),
+        "product_rating": _pick(raw, _RATING_KEYS, "", str),
+        "sold_count": _pick(raw, _SOLD_KEYS, 0, int),
+        "review_count": _pick(raw, _REVIEW_KEYS, 0, int),
+        "seller_name": _pick(raw, _SELLER_NAME_KEYS, ""),
+        "seller_id": _pick(raw, _SELLER_ID_KEYS, "", str),
         "promotion_labels": raw.get("promotion_labels") or raw.get("badges") or [],
         "created_at": to_iso8601(raw.get("created_at")),
         "last_seen_at": to_iso8601(raw.get("last_seen_at")),
         "_source": raw.get("_source") or "mock",
-    }
\ No newline at end of file
+    }
+
+def map_product_strict(raw: Dict[str, Any], currency: str) -> Dict[str, Any]:
+    """
+    Finalize a product that already uses the canonical field names (our mock
+    and placeholder records). Skips the alias fallbacks and currency guessing
+    of ``map_product``; output is identical for such records.
+    """
+    price = float(raw["price"])
+    return {
+        "product_id": str(raw["product_id"]),
+        "title": raw["title"],
+        "cover": raw["cover"],
+        "img": raw["img"],
+        "price": price,
+        "currency": currency,
+        "format_price": raw["format_price"] or f"{price:.2f} {currency}",
+        "discount": raw["discount"],
+        "warehouse_region": raw["warehouse_region"],
+        "product_rating": str(raw["product_rating"]),
+        "sold_count": raw["sold_count"],
+        "review_count": raw["review_count"],
+        "seller_name": raw["seller_name"],
+        "seller_id": raw["seller_id"],
+        "promotion_labels": raw["promotion_labels"],
+        "created_at": to_iso8601(raw.get("created_at")),
+        "last_seen_at": to_iso8601(raw.get("last_seen_at")),
+        "_source": raw["_source"],
+    }
@@ -4,6 +4,9 @@ from typing import Literal, Optional, List, Any, Dict
 SortType = Literal["PRICE_ASC", "PRICE_DESC", "BEST_SELLERS", "RELEVANCE"]
 Region = str  # Expect two-letter country code like "US", "VN"
 
+# Regions the scraper maps to a currency; already canonical, so they skip checks.
+_KNOWN_REGIONS = frozenset({"US", "VN", "GB", "EU", "PK", "ID", "MY", "TH", "PH"})
+
 class InputModel(BaseModel):
     keyword: Optional[str] = Field(
         default=None, description="Search keyword for TikTok Shop listings"
@@ -26,9 +29,9 @@ class InputModel(BaseModel):
     @field_validator("region")
     @classmethod
     def validate_region(cls, v: Optional[str]) -> Optional[str]:
-        if v is None:
+        if v is None or v in _KNOWN_REGIONS:
             return v
-        if not isinstance(v, str) or len(v) != 2 or not v.isalpha():
+        if not isinstance(v, str) or len(v) != 2 or not v.isascii() or not v.isalpha():
             raise ValueError("region must be a two-letter ISO country code")
         return v.upper()
 
@@ -51,4 +54,12 @@ def validate_input(payload: dict) -> InputModel:
         return InputModel.model_validate(payload or {})
     except ValidationError as e:
         # Re-raise with clean error message
-        raise ValidationError(e.errors()) from None
\ No newline at end of file
+        raise ValidationError(e.errors()) from None
+
+def validate_input_json(payload: bytes | str) -> InputModel:
+    """
+    Validate a raw JSON document (e.g. a request body or input file) into
+    InputModel. Parsing and validation happen in one pydantic-core pass, so
+    prefer this over ``json.loads`` + ``validate_input`` when holding raw JSON.
+    """
+    return InputModel.model_validate_json(payload or b"{}")
@@ -0,0 +1,34 @@
+import threading
+
+from src.runner import iter_scrape
+
+class FakeScraper:
+    def __init__(self) -> None:
+        self.release_first = threading.Event()
+        self.started = []
+        self.lock = threading.Lock()
+
+    def scrape_url(self, url):
+        with self.lock:
+            self.started.append(url)
+        if url == "u0":
+            self.release_first.wait(timeout=5)
+        return [{"url": url}]
+
+def test_iter_scrape_keeps_order_and_bounds_in_flight_urls():
+    scraper = FakeScraper()
+    urls = [f"u{i}" for i in range(10)]
+    started_while_blocked = []
+
+    def release() -> None:
+        started_while_blocked.extend(scraper.started)
+        scraper.release_first.set()
+
+    timer = threading.Timer(0.2, release)
+    timer.start()
+    rows = list(iter_scrape(scraper, urls, concurrency=3))
+    timer.join()
+
+    # While u0 was blocked, only the first window of URLs could start.
+    assert sorted(started_while_blocked) == ["u0", "u1", "u2"]
+    assert rows == [{"url": url} for url in urls]
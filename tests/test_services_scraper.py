@@ -0,0 +1,38 @@
+import httpx
+
+from src.services.scraper import ScraperConfig, TikTokShopScraper, _is_retryable
+
+def make_scraper() -> TikTokShopScraper:
+    cfg = ScraperConfig(
+        offline_mode=True,
+        base_url="",
+        timeout_seconds=5,
+        max_retries=2,
+        retry_backoff_seconds=0.0,
+        user_agent="test",
+    )
+    return TikTokShopScraper(cfg)
+
+def test_search_with_zero_limit_returns_empty():
+    scraper = make_scraper()
+    for sort in ("RELEVANCE", "PRICE_ASC", "BEST_SELLERS"):
+        assert scraper.search(
+            keyword="shoes", is_trending=False, region="US", sort=sort, limit=0
+        ) == []
+
+def test_search_with_negative_limit_returns_empty():
+    scraper = make_scraper()
+    assert scraper.search(
+        keyword="shoes", is_trending=False, region="US", sort="RELEVANCE", limit=-5
+    ) == []
+
+def status_error(code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://example.com/")
+    response = httpx.Response(code, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+def test_only_transient_failures_are_retried():
+    assert _is_retryable(status_error(503))
+    assert _is_retryable(status_error(429))
+    assert not _is_retryable(status_error(404))
+    assert _is_retryable(httpx.ConnectError("refused"))
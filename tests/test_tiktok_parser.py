@@ -0,0 +1,115 @@
+import pytest
+import requests
+from bs4 import BeautifulSoup
+
+from src.extractors import tiktok_parser
+from src.extractors.tiktok_parser import TikTokShopScraper
+
+LISTING_URL = "https://shop.tiktok.com/category/shoes"
+
+CARD_FIXTURES = [
+    # plain title and price spans
+    """
+    <a href="/product/1"><img src="https://example.com/1.webp">
+    <span>Sneaker One</span><span>$10.00</span></a>
+    """,
+    # price wrapped in a single child tag (BS4's .string descends into it)
+    """
+    <a href="/product/2"><span>Sneaker Two</span><span><b>$30</b></span></a>
+    """,
+    # price span with mixed children has no .string and is skipped
+    """
+    <a href="/product/3"><span>Sneaker Three</span><span>from <b>$5</b></span>
+    <span> $7 </span></a>
+    """,
+    # price inside a comment is matched but contributes no text
+    """
+    <a href="/product/4"><span>Sneaker Four</span><span><!-- $9 --></span><span>$11</span></a>
+    """,
+    # search cards with nested links, duplicates and empty cards
+    """
+    <div data-e2e="search-card"><a href="/product/5"><h2>Boot</h2></a><span>$40</span></div>
+    <div data-e2e="search-card"><a href="/product/5"><span>Boot again</span></a></div>
+    <div data-e2e="search-card"><img src="https://example.com/x.webp"></div>
+    """,
+]
+
+def parse_cards(html: str):
+    scraper = TikTokShopScraper()
+    try:
+        return scraper._products_from_cards(html.encode("utf-8"), LISTING_URL, set())
+    finally:
+        scraper.close()
+
+@pytest.mark.skipif(tiktok_parser.LexborHTMLParser is None, reason="selectolax not installed")
+@pytest.mark.parametrize("html", CARD_FIXTURES)
+def test_card_parsing_matches_between_backends(html, monkeypatch):
+    lexbor_products = parse_cards(html)
+    monkeypatch.setattr(tiktok_parser, "LexborHTMLParser", None)
+    assert lexbor_products == parse_cards(html)
+    assert lexbor_products
+
+CP1252_PAGE = (
+    '<html><head><meta charset="windows-1252"></head><body>'
+    '<a href="/product/1"><span>Café</span><span>$5</span></a></body></html>'
+).encode("cp1252")
+UTF8_PAGE = (
+    '<html><body><a href="/product/2"><span>Mug</span><span>$7</span></a></body></html>'
+).encode("utf-8")
+
+# (raw bytes, Content-Type) pairs whose charset is not simply declared UTF-8
+ENCODED_PAGES = [
+    # charset only declared in <meta>
+    (CP1252_PAGE, "text/html"),
+    # unknown charset name in the header
+    (UTF8_PAGE, "text/html; charset=bogus-enc"),
+]
+
+def scrape_page(content: bytes, content_type: str):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    response.headers["Content-Type"] = content_type
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    scraper = TikTokShopScraper()
+    scraper.session.get = lambda url, timeout=None: response
+    try:
+        return scraper.scrape_url(LISTING_URL)
+    finally:
+        scraper.close()
+
+@pytest.mark.skipif(tiktok_parser.LexborHTMLParser is None, reason="selectolax not installed")
+@pytest.mark.parametrize("content, content_type", ENCODED_PAGES)
+def test_page_encoding_matches_between_backends(content, content_type, monkeypatch):
+    lexbor_products = scrape_page(content, content_type)
+    monkeypatch.setattr(tiktok_parser, "LexborHTMLParser", None)
+    assert lexbor_products == scrape_page(content, content_type)
+    assert lexbor_products
+
+def test_meta_charset_is_used_without_header_charset():
+    products = scrape_page(CP1252_PAGE, "text/html")
+    assert products[0]["title"] == "Café"
+
+def test_card_price_inside_single_child_tag():
+    products = parse_cards(CARD_FIXTURES[1])
+    assert products[0].sale_price is not None
+
+@pytest.mark.parametrize(
+    "script",
+    [
+        'window.__CFG__ = {"env": "prod"}; window.__DATA__ = {"product": '
+        '{"title": "Mug", "price": "$5", "url": "https://shop.tiktok.com/product/1"}};',
+        'init({"a": 1}, {"product": {"title": "Mug", "price": "$5", '
+        '"url": "https://shop.tiktok.com/product/1"}});',
+    ],
+)
+def test_listing_reads_every_json_object_in_a_script(script):
+    html = f"<html><head><script>{script}</script></head><body></body></html>"
+    scraper = TikTokShopScraper()
+    try:
+        head_soup = BeautifulSoup(html, scraper.html_parser)
+        products = scraper._parse_listing_page(head_soup, html.encode("utf-8"), LISTING_URL)
+    finally:
+        scraper.close()
+    assert [p.title for p in products] == ["Mug"]
+    assert products[0].product_link == "https://shop.tiktok.com/product/1"
@@ -0,0 +1,11 @@
+import json
+
+from src.extractors.utils_format import load_settings
+
+def test_load_settings_returns_independent_copies(tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"export": {"default_format": "json"}}), encoding="utf-8")
+
+    load_settings(str(path))["export"]["default_format"] = "xlsx"
+
+    assert load_settings(str(path))["export"]["default_format"] == "json"
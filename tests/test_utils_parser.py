@@ -0,0 +1,6 @@
+from src.utils.parser import map_product
+
+def test_map_product_accepts_string_images():
+    product = map_product({"id": 1, "images": "https://example.com/a.webp"}, "US")
+    assert product["img"] == ["https://example.com/a.webp"]
+    assert product["cover"] == "https://example.com/a.webp"
@@ -0,0 +1,5 @@
+from src.utils import parser, validator
+
+def test_known_regions_match_currency_map():
+    # validator keeps its own copy so it does not import parser internals
+    assert validator._KNOWN_REGIONS == frozenset(parser._CURRENCY_BY_REGION)